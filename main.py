@@ -1,19 +1,33 @@
 import os
 import tempfile
-import whisper
+import psutil
+
+# Pin OpenMP/BLAS threading to physical cores before the inference
+# runtime loads - oversubscribing hyperthreads slows the encoder GEMMs
+PHYSICAL_CORES = psutil.cpu_count(logical=False) or 4
+os.environ.setdefault("OMP_NUM_THREADS", str(PHYSICAL_CORES))
+
+import ctranslate2
+from faster_whisper import WhisperModel
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-import aiofiles
-from typing import List, Dict, Optional
-import re
-from datetime import timedelta, datetime
+from typing import Optional
+from datetime import datetime
+from pathlib import PurePosixPath
+from urllib.parse import quote
 import asyncio
+import atexit
+import ctypes
 import gc
-import psutil
+import shutil
+import sqlite3
+import threading
+import time
 import uuid
-import json
 from enum import Enum
+from contextlib import asynccontextmanager
+from srt_format import create_srt_content, write_srt
 try:
     from render_config import get_instance_config, get_optimized_whisper_params
 except ImportError:
@@ -27,13 +41,15 @@ except ImportError:
     
     def get_optimized_whisper_params():
         return {
-            "fp16": False,
-            "verbose": True,  # Enable verbose to see progress
+            "beam_size": int(os.getenv("WHISPER_BEAM_SIZE", "1")),  # Greedy by default - beam search multiplies decoder cost
+            "best_of": 1,  # No candidate resampling
+            "vad_filter": not os.getenv("DISABLE_VAD"),  # Skip silent regions before the encoder runs
+            "vad_parameters": {"min_silence_duration_ms": 500, "speech_pad_ms": 200},
             "word_timestamps": False,
             "condition_on_previous_text": False,
-            "temperature": 0,  # Use deterministic decoding
+            "temperature": 0,  # Use deterministic decoding, no fallback ladder
             "compression_ratio_threshold": 2.4,  # Prevent infinite loops
-            "logprob_threshold": -1.0,  # More conservative threshold
+            "log_prob_threshold": -1.0,  # More conservative threshold
             "no_speech_threshold": 0.6,  # Higher threshold for silence
         }
 
@@ -44,34 +60,110 @@ class JobStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
-# In-memory job storage (in production, use Redis or database)
-jobs: Dict[str, Dict] = {}
+# Job storage - SQLite in WAL mode, shared across workers. A plain
+# in-process dict meant that under multiple workers a status poll could
+# land on a worker that never saw the job and 404; the database also
+# survives restarts and replaces the per-call cleanup scans with
+# indexed queries.
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "/tmp/jobs.db")
+
+jobs_db = sqlite3.connect(JOBS_DB_PATH, check_same_thread=False)
+jobs_db.row_factory = sqlite3.Row
+jobs_db.execute("PRAGMA journal_mode=WAL")
+jobs_db.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        filename TEXT NOT NULL,
+        file_size INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        created_ts REAL NOT NULL,
+        started_ts REAL,
+        completed_ts REAL,
+        srt_path TEXT,
+        srt_filename TEXT,
+        segments_count INTEGER,
+        detected_language TEXT,
+        error TEXT
+    )
+""")
+jobs_db.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_ts ON jobs(created_ts)")
+jobs_db.commit()
+
+# The connection is shared between request handlers and executor
+# threads; serialize multi-statement sections explicitly
+jobs_db_lock = threading.Lock()
+
+def update_job(job_id: str, **fields):
+    """Update columns on a job row"""
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with jobs_db_lock:
+        jobs_db.execute(
+            f"UPDATE jobs SET {assignments} WHERE id = ?",
+            (*fields.values(), job_id)
+        )
+        jobs_db.commit()
+
+def get_job_row(job_id: str):
+    """Fetch a single job row, or None if it does not exist"""
+    with jobs_db_lock:
+        return jobs_db.execute(
+            "SELECT * FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+
+def job_to_response(row) -> dict:
+    """Convert a job row to the public API shape (no internal paths)"""
+    return {
+        "id": row["id"],
+        "filename": row["filename"],
+        "file_size": row["file_size"],
+        "status": row["status"],
+        "created_at": datetime.utcfromtimestamp(row["created_ts"]),
+        "started_at": datetime.utcfromtimestamp(row["started_ts"]) if row["started_ts"] else None,
+        "completed_at": datetime.utcfromtimestamp(row["completed_ts"]) if row["completed_ts"] else None,
+        "srt_filename": row["srt_filename"],
+        "segments_count": row["segments_count"],
+        "detected_language": row["detected_language"],
+        "error": row["error"]
+    }
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the Whisper model once at startup so the first upload is warm"""
+    global model
+    model = await asyncio.to_thread(load_model_with_fallback)
+    # The model graph is permanent; freeze it out of the GC generations
+    # so collections stop rescanning millions of long-lived objects
+    gc.freeze()
+    yield
 
 app = FastAPI(
     title="Audio Transcription API",
     description="API for converting audio files to SRT subtitles using OpenAI Whisper",
-    version="1.1.0"
+    version="1.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add URL normalization middleware to handle double slashes
-from fastapi import Request
-from fastapi.responses import RedirectResponse
+# URL normalization middleware to handle double slashes
+class NormalizePathMiddleware:
+    """Normalize request paths by collapsing double slashes in place
 
-@app.middleware("http")
-async def normalize_url_middleware(request: Request, call_next):
-    """Normalize URLs by removing double slashes and handling common URL issues"""
-    url_path = str(request.url.path)
-    
-    # Fix double slashes (//upload -> /upload)
-    if "//" in url_path and url_path != "/":
-        normalized_path = url_path.replace("//", "/")
-        # Redirect to normalized URL
-        query_string = str(request.url.query)
-        new_url = f"{normalized_path}{'?' + query_string if query_string else ''}"
-        return RedirectResponse(url=new_url, status_code=307)  # 307 preserves POST method
-    
-    response = await call_next(request)
-    return response
+    Rewrites the ASGI scope instead of answering with a 307, so a
+    request to //upload is routed on the first try - a redirect would
+    force the client to retransmit the whole upload body. Pure ASGI so
+    no Starlette Request object is built on the fast path.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "//" in scope["path"]:
+            scope["path"] = scope["path"].replace("//", "/")
+            if scope.get("raw_path"):
+                scope["raw_path"] = scope["raw_path"].replace(b"//", b"/")
+        await self.app(scope, receive, send)
+
+app.add_middleware(NormalizePathMiddleware)
 
 # Add CORS middleware
 app.add_middleware(
@@ -88,79 +180,157 @@ model = None
 # Get optimized configuration for current instance
 instance_config = get_instance_config()
 
-# Supported audio formats
-SUPPORTED_FORMATS = {".mp3", ".wav", ".m4a", ".flac", ".ogg", ".wma"}
+# Transcribe kwargs never change after startup; build the dict once
+WHISPER_PARAMS = get_optimized_whisper_params()
+
+# Supported audio formats - frozen so the set and the derived strings
+# below are computed exactly once, in a stable order
+SUPPORTED_FORMATS = frozenset({".mp3", ".wav", ".m4a", ".flac", ".ogg", ".wma"})
+SUPPORTED_FORMAT_LIST = tuple(sorted(SUPPORTED_FORMATS))
+UNSUPPORTED_FORMAT_MSG = (
+    f"Unsupported file format. Supported formats: {', '.join(SUPPORTED_FORMAT_LIST)}"
+)
 # Use instance-specific file size limit
 MAX_FILE_SIZE = instance_config["max_file_size_mb"] * 1024 * 1024
+MAX_FILE_SIZE_MB = MAX_FILE_SIZE >> 20
+FILE_TOO_LARGE_MSG = f"File too large. Maximum size: {MAX_FILE_SIZE_MB}MB"
+# Upload streaming chunk size - 1 MiB amortizes coroutine and syscall
+# overhead (8KB chunks meant ~12,800 await hops for a 100MB upload)
+UPLOAD_CHUNK_SIZE = 1 << 20
 
-async def get_model_async():
-    """Async wrapper for model loading with timeout"""
-    global model
-    if model is None:
-        model_size = instance_config["whisper_model"]
-        print(f"Loading Whisper model: {model_size} (optimized for current instance)")
-        
-        try:
-            # Try loading with timeout
-            model = await asyncio.wait_for(
-                asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: whisper.load_model(model_size)
-                ),
-                timeout=120  # 2 minutes timeout for model loading
+# One scratch directory per worker process; files are named by UUID so
+# there is no mkstemp/unlink churn, and everything is removed at exit.
+# Point TMPDIR at /dev/shm in the container to keep writes off disk.
+TEMP_DIR = tempfile.mkdtemp(prefix="srt_")
+atexit.register(shutil.rmtree, TEMP_DIR, ignore_errors=True)
+
+# Serialize transcription: concurrent decodes share one model, contend
+# for the same cores, and together can push RSS past the instance limit
+TRANSCRIBE_SEM = asyncio.Semaphore(int(os.getenv("TRANSCRIBE_CONCURRENCY", "1")))
+
+# Per-request RSS logging is opt-in; each sample reads /proc
+DEBUG_MEM = bool(os.getenv("DEBUG_MEM"))
+
+# Hard cap on a single transcription (seconds)
+TRANSCRIPTION_TIMEOUT = int(os.getenv("TRANSCRIPTION_TIMEOUT", "300"))
+
+def has_cuda() -> bool:
+    """Check whether CTranslate2 can see a CUDA device"""
+    try:
+        return ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+def load_whisper_model(model_size: str) -> WhisperModel:
+    """Load a faster-whisper (CTranslate2) model with quantized weights"""
+    # On GPU, float16 halves memory bandwidth and enables tensor cores;
+    # on CPU, int8 matches fp16 checkpoint quality while roughly halving
+    # disk and memory. Override for accuracy-sensitive deployments.
+    if has_cuda():
+        device = "cuda"
+        compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "float16")
+    else:
+        device = "cpu"
+        compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=PHYSICAL_CORES,
+        num_workers=1,  # Transcription is serialized; one worker is enough
+    )
+
+def load_model_with_fallback() -> WhisperModel:
+    """Load the configured Whisper model, falling back to 'tiny' on failure"""
+    model_size = instance_config["whisper_model"]
+    print(f"Loading Whisper model: {model_size} (optimized for current instance)")
+
+    try:
+        loaded = load_whisper_model(model_size)
+        print("Model loaded successfully")
+    except Exception as e:
+        print(f"Failed to load {model_size} model: {e}")
+        print("Falling back to 'tiny' model...")
+        loaded = load_whisper_model("tiny")
+        print("Tiny model loaded successfully")
+    return loaded
+
+def run_transcription(whisper_model: WhisperModel, audio):
+    """Run transcription and materialize the segment generator
+
+    `audio` can be a file path or a binary file-like object -
+    faster-whisper decodes either in-process via PyAV.
+    """
+    segments, info = whisper_model.transcribe(
+        audio,
+        task="transcribe",
+        language=None,  # Auto-detect language
+        **WHISPER_PARAMS
+    )
+    return list(segments), info
+
+def transcribe_to_srt(audio, srt_path: str) -> tuple:
+    """Transcribe audio and stream the SRT straight to disk
+
+    `audio` is a path or binary file-like object. Runs synchronously on
+    an executor thread so the event loop stays free for status polling;
+    returns (segments_count, language).
+    """
+    segments, info = model.transcribe(
+        audio,
+        task="transcribe",
+        language=None,
+        **WHISPER_PARAMS
+    )
+    with open(srt_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        segments_count = write_srt(segments, f)
+    return segments_count, info.language or 'unknown'
+
+def _splice_upload(src, dest, limit: int) -> int:
+    """Copy the upload's spooled file into dest, stopping past the limit
+
+    Runs synchronously (dispatched once to the thread pool) so the copy
+    costs zero event-loop hops regardless of file size.
+    """
+    size = 0
+    while chunk := src.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > limit:
+            break
+        dest.write(chunk)
+    return size
+
+# Uploads at or below this size stay fully in RAM; larger ones spill
+# to an anonymous temp file automatically
+SPOOL_MAX_SIZE = 5 << 20
+
+async def spool_upload(file: UploadFile) -> tuple:
+    """Copy an upload into a SpooledTemporaryFile, enforcing the size limit
+
+    Small uploads never touch disk this way, and the decoder reads the
+    spool directly. The returned file object is kept open for background
+    processing and must be closed by the caller; returns (spool, size).
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE, dir=TEMP_DIR)
+
+    try:
+        # Starlette has already spooled the body into file.file; splice it
+        # across in a single thread-pool call instead of an async read loop
+        await file.seek(0)
+        file_size = await asyncio.to_thread(
+            _splice_upload, file.file, spool, MAX_FILE_SIZE
+        )
+        if file_size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=FILE_TOO_LARGE_MSG
             )
-            print("Model loaded successfully")
-        except asyncio.TimeoutError:
-            print(f"Timeout loading {model_size} model, falling back to 'base'...")
-            try:
-                model = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: whisper.load_model("base")
-                    ),
-                    timeout=120
-                )
-                print("Base model loaded successfully")
-            except asyncio.TimeoutError:
-                print("Timeout loading base model, falling back to 'tiny'...")
-                model = await asyncio.wait_for(
-                    asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: whisper.load_model("tiny")
-                    ),
-                    timeout=60
-                )
-                print("Tiny model loaded successfully")
-        except Exception as e:
-            print(f"Failed to load {model_size} model: {e}")
-            print("Falling back to 'base' model...")
-            try:
-                model = whisper.load_model("base")
-                print("Base model loaded successfully")
-            except Exception as e2:
-                print(f"Failed to load base model: {e2}")
-                print("Falling back to 'tiny' model...")
-                model = whisper.load_model("tiny")
-                print("Tiny model loaded successfully")
-    return model
-
-def get_model():
-    """Lazy load the Whisper model to save memory"""
-    global model
-    if model is None:
-        # Force use of base model for reliability
-        model_size = "base"
-        print(f"Loading Whisper model: {model_size} (forced for reliability)")
-        
-        try:
-            model = whisper.load_model(model_size)
-            print("Model loaded successfully")
-        except Exception as e:
-            print(f"Failed to load {model_size} model: {e}")
-            print("Falling back to 'tiny' model...")
-            model = whisper.load_model("tiny")
-            print("Tiny model loaded successfully")
-    return model
+    except Exception as e:
+        spool.close()
+        raise e
+
+    spool.seek(0)
+    return spool, file_size
 
 def cleanup_temp_files(*file_paths):
     """Clean up temporary files"""
@@ -171,133 +341,129 @@ def cleanup_temp_files(*file_paths):
         except Exception as e:
             print(f"Warning: Could not delete temp file {file_path}: {e}")
 
+# glibc keeps freed arena pages mapped, so RSS creeps upward even though
+# the allocator has reclaimed the memory; malloc_trim hands it back
+try:
+    _LIBC = ctypes.CDLL("libc.so.6")
+except OSError:  # non-glibc platform (musl, macOS)
+    _LIBC = None
+
+def release_free_memory():
+    """Return freed heap arenas to the kernel after a large job"""
+    if _LIBC is not None:
+        try:
+            _LIBC.malloc_trim(0)
+        except Exception:
+            pass
+
+# Constructing psutil.Process() re-reads /proc each time; cache one
+# handle per worker and only sample memory_info() on demand
+try:
+    _PROCESS = psutil.Process()
+except Exception:
+    _PROCESS = None
+
 def get_memory_usage():
     """Get current memory usage"""
     try:
-        process = psutil.Process()
-        return process.memory_info().rss / 1024 / 1024  # MB
+        return _PROCESS.memory_info().rss / 1024 / 1024  # MB
     except:
         return 0
 
-def format_timestamp(seconds: float) -> str:
-    """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
-    td = timedelta(seconds=seconds)
-    hours, remainder = divmod(td.total_seconds(), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = int((seconds % 1) * 1000)
-    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
-
-def create_srt_content(segments: List[dict]) -> str:
-    """Convert Whisper segments to SRT format"""
-    srt_content = ""
-    
-    for i, segment in enumerate(segments, 1):
-        start_time = format_timestamp(segment['start'])
-        end_time = format_timestamp(segment['end'])
-        text = segment['text'].strip()
-        
-        srt_content += f"{i}\n"
-        srt_content += f"{start_time} --> {end_time}\n"
-        srt_content += f"{text}\n\n"
-    
-    return srt_content
-
-async def process_transcription_job(job_id: str, temp_audio_path: str, filename: str):
+async def process_transcription_job(job_id: str, audio_spool, filename: str):
     """Background task to process transcription"""
     try:
         # Update job status to processing
-        jobs[job_id]["status"] = JobStatus.PROCESSING
-        jobs[job_id]["started_at"] = datetime.utcnow().isoformat()
-        
+        update_job(job_id, status=JobStatus.PROCESSING.value, started_ts=time.time())
+
         print(f"Starting transcription job {job_id}")
         
-        # Load model
-        whisper_model = get_model()
-        
-        # Transcribe audio
-        whisper_params = get_optimized_whisper_params()
-        result = whisper_model.transcribe(
-            temp_audio_path,
-            task="transcribe",
-            language=None,
-            **whisper_params
-        )
-        
-        # Convert to SRT
-        srt_content = create_srt_content(result['segments'])
-        
-        # Save SRT file
-        srt_filename = f"{os.path.splitext(filename)[0]}_subtitles.srt"
-        srt_path = f"/tmp/{job_id}_{srt_filename}"
-        
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            f.write(srt_content)
-        
+        srt_filename = f"{PurePosixPath(filename).stem}_subtitles.srt"
+        srt_path = os.path.join(TEMP_DIR, f"{job_id}_{srt_filename}")
+
+        # Run the blocking decode on an executor thread so the event loop
+        # keeps serving /jobs/{id} polls and health checks, with a hard
+        # timeout instead of letting a stuck decode hold the worker
+        async with TRANSCRIBE_SEM:
+            segments_count, detected_language = await asyncio.wait_for(
+                asyncio.get_event_loop().run_in_executor(
+                    None, transcribe_to_srt, audio_spool, srt_path
+                ),
+                timeout=TRANSCRIPTION_TIMEOUT
+            )
+
         # Update job with results
-        jobs[job_id].update({
-            "status": JobStatus.COMPLETED,
-            "completed_at": datetime.utcnow().isoformat(),
-            "srt_path": srt_path,
-            "srt_filename": srt_filename,
-            "segments_count": len(result['segments']),
-            "detected_language": result.get('language', 'unknown')
-        })
-        
+        update_job(
+            job_id,
+            status=JobStatus.COMPLETED.value,
+            completed_ts=time.time(),
+            srt_path=srt_path,
+            srt_filename=srt_filename,
+            segments_count=segments_count,
+            detected_language=detected_language
+        )
+
         print(f"Transcription job {job_id} completed successfully")
-        
+
+    except asyncio.TimeoutError:
+        # str(TimeoutError()) is empty, so store an explicit message
+        error_msg = f"Transcription timed out after {TRANSCRIPTION_TIMEOUT}s"
+        update_job(
+            job_id,
+            status=JobStatus.FAILED.value,
+            completed_ts=time.time(),
+            error=error_msg
+        )
+        print(f"Transcription job {job_id} failed: {error_msg}")
     except Exception as e:
         # Update job with error
-        jobs[job_id].update({
-            "status": JobStatus.FAILED,
-            "completed_at": datetime.utcnow().isoformat(),
-            "error": str(e)
-        })
+        update_job(
+            job_id,
+            status=JobStatus.FAILED.value,
+            completed_ts=time.time(),
+            error=str(e)
+        )
         print(f"Transcription job {job_id} failed: {e}")
     
     finally:
-        # Clean up temp audio file
-        cleanup_temp_files(temp_audio_path)
-        gc.collect()
+        # Closing the spool discards the in-memory buffer or the
+        # anonymous spill file, whichever it ended up as
+        audio_spool.close()
+        release_free_memory()
 
 def create_job(filename: str, file_size: int) -> str:
     """Create a new transcription job"""
     job_id = str(uuid.uuid4())
-    
-    jobs[job_id] = {
-        "id": job_id,
-        "filename": filename,
-        "file_size": file_size,
-        "status": JobStatus.PENDING,
-        "created_at": datetime.utcnow().isoformat(),
-        "started_at": None,
-        "completed_at": None,
-        "srt_path": None,
-        "srt_filename": None,
-        "segments_count": None,
-        "detected_language": None,
-        "error": None
-    }
-    
+
+    with jobs_db_lock:
+        jobs_db.execute(
+            "INSERT INTO jobs (id, filename, file_size, status, created_ts) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job_id, filename, file_size, JobStatus.PENDING.value, time.time())
+        )
+        jobs_db.commit()
+
     return job_id
 
 def cleanup_old_jobs():
     """Clean up jobs older than 24 hours"""
-    cutoff_time = datetime.utcnow() - timedelta(hours=24)
-    
-    jobs_to_remove = []
-    for job_id, job in jobs.items():
-        created_at = datetime.fromisoformat(job["created_at"])
-        if created_at < cutoff_time:
-            # Clean up SRT file if it exists
-            if job.get("srt_path") and os.path.exists(job["srt_path"]):
-                cleanup_temp_files(job["srt_path"])
-            jobs_to_remove.append(job_id)
-    
-    for job_id in jobs_to_remove:
-        del jobs[job_id]
-    
-    if jobs_to_remove:
-        print(f"Cleaned up {len(jobs_to_remove)} old jobs")
+    cutoff_ts = time.time() - 24 * 3600
+
+    with jobs_db_lock:
+        rows = jobs_db.execute(
+            "SELECT srt_path FROM jobs WHERE created_ts < ?", (cutoff_ts,)
+        ).fetchall()
+        if not rows:
+            return
+        jobs_db.execute("DELETE FROM jobs WHERE created_ts < ?", (cutoff_ts,))
+        jobs_db.commit()
+
+    # Clean up SRT files outside the lock
+    for row in rows:
+        if row["srt_path"]:
+            cleanup_temp_files(row["srt_path"])
+
+    print(f"Cleaned up {len(rows)} old jobs")
 
 @app.get("/")
 async def root():
@@ -305,8 +471,8 @@ async def root():
     memory_mb = get_memory_usage()
     return {
         "message": "Audio Transcription API is running",
-        "supported_formats": list(SUPPORTED_FORMATS),
-        "max_file_size_mb": MAX_FILE_SIZE // (1024 * 1024),
+        "supported_formats": SUPPORTED_FORMAT_LIST,
+        "max_file_size_mb": MAX_FILE_SIZE_MB,
         "memory_usage_mb": round(memory_mb, 1),
         "model_loaded": model is not None
     }
@@ -335,46 +501,36 @@ async def submit_transcription_job(background_tasks: BackgroundTasks, file: Uplo
         # Clean up old jobs periodically
         cleanup_old_jobs()
         
-        # Check memory before processing
-        initial_memory = get_memory_usage()
-        print(f"Initial memory usage: {initial_memory:.1f}MB")
-        
+        # Check memory before processing (debug only - each sample costs
+        # a /proc read and this runs on every submit)
+        if DEBUG_MEM:
+            print(f"Initial memory usage: {get_memory_usage():.1f}MB")
+
         # Validate file format
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
-        
-        file_extension = os.path.splitext(file.filename)[1].lower()
+
+        # Parse the filename once; PurePosixPath also strips any path
+        # separators a hostile client might smuggle in
+        upload_name = PurePosixPath(file.filename)
+        file_extension = upload_name.suffix.lower()
         if file_extension not in SUPPORTED_FORMATS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file format. Supported formats: {', '.join(SUPPORTED_FORMATS)}"
+                detail=UNSUPPORTED_FORMAT_MSG
             )
-        
-        # Read file in chunks to avoid memory issues
-        file_size = 0
-        temp_audio_fd, temp_audio_path = tempfile.mkstemp(suffix=file_extension)
-        
-        try:
-            with os.fdopen(temp_audio_fd, 'wb') as temp_file:
-                while chunk := await file.read(8192):  # Read in 8KB chunks
-                    file_size += len(chunk)
-                    if file_size > MAX_FILE_SIZE:
-                        raise HTTPException(
-                            status_code=413,
-                            detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB"
-                        )
-                    temp_file.write(chunk)
-        except Exception as e:
-            cleanup_temp_files(temp_audio_path)
-            raise e
-        
+
+        # Copy the upload into a spool the background job can outlive
+        # the request with; small files stay entirely in memory
+        audio_spool, file_size = await spool_upload(file)
+
         print(f"File size: {file_size / (1024 * 1024):.1f}MB")
-        
+
         # Create job
         job_id = create_job(file.filename, file_size)
-        
+
         # Start background processing
-        background_tasks.add_task(process_transcription_job, job_id, temp_audio_path, file.filename)
+        background_tasks.add_task(process_transcription_job, job_id, audio_spool, file.filename)
         
         return {
             "job_id": job_id,
@@ -400,23 +556,17 @@ async def get_job_status(job_id: str):
     - **job_id**: The job ID returned from job submission
     - Returns: Job status and details
     """
-    if job_id not in jobs:
+    row = get_job_row(job_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    job = jobs[job_id].copy()
-    
+
+    job = job_to_response(row)
+
     # Calculate processing time if applicable
-    if job["started_at"]:
-        started_at = datetime.fromisoformat(job["started_at"])
-        if job["completed_at"]:
-            completed_at = datetime.fromisoformat(job["completed_at"])
-            job["processing_time_seconds"] = (completed_at - started_at).total_seconds()
-        else:
-            job["processing_time_seconds"] = (datetime.utcnow() - started_at).total_seconds()
-    
-    # Remove internal paths from response
-    job.pop("srt_path", None)
-    
+    if row["started_ts"]:
+        end_ts = row["completed_ts"] or time.time()
+        job["processing_time_seconds"] = end_ts - row["started_ts"]
+
     return job
 
 @app.get("/jobs/{job_id}/download")
@@ -427,21 +577,20 @@ async def download_srt_file(job_id: str):
     - **job_id**: The job ID returned from job submission
     - Returns: SRT file download
     """
-    if job_id not in jobs:
+    job = get_job_row(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    job = jobs[job_id]
-    
-    if job["status"] != JobStatus.COMPLETED:
+
+    if job["status"] != JobStatus.COMPLETED.value:
         raise HTTPException(
             status_code=400,
             detail=f"Job is not completed. Current status: {job['status']}"
         )
-    
-    srt_path = job.get("srt_path")
+
+    srt_path = job["srt_path"]
     if not srt_path or not os.path.exists(srt_path):
         raise HTTPException(status_code=404, detail="SRT file not found")
-    
+
     return FileResponse(
         path=srt_path,
         filename=job["srt_filename"],
@@ -459,149 +608,123 @@ async def list_jobs(limit: int = 10, status: Optional[JobStatus] = None):
     """
     # Clean up old jobs
     cleanup_old_jobs()
-    
-    # Filter and sort jobs
-    filtered_jobs = []
-    for job in jobs.values():
-        if status is None or job["status"] == status:
-            job_copy = job.copy()
-            job_copy.pop("srt_path", None)  # Remove internal paths
-            filtered_jobs.append(job_copy)
-    
-    # Sort by creation time (newest first)
-    filtered_jobs.sort(key=lambda x: x["created_at"], reverse=True)
-    
+
+    with jobs_db_lock:
+        if status is None:
+            rows = jobs_db.execute(
+                "SELECT * FROM jobs ORDER BY created_ts DESC LIMIT ?", (limit,)
+            ).fetchall()
+            total = jobs_db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        else:
+            rows = jobs_db.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_ts DESC LIMIT ?",
+                (status.value, limit)
+            ).fetchall()
+            total = jobs_db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (status.value,)
+            ).fetchone()[0]
+        active_jobs = jobs_db.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)",
+            (JobStatus.PENDING.value, JobStatus.PROCESSING.value)
+        ).fetchone()[0]
+
     return {
-        "jobs": filtered_jobs[:limit],
-        "total": len(filtered_jobs),
-        "active_jobs": len([j for j in jobs.values() if j["status"] in [JobStatus.PENDING, JobStatus.PROCESSING]])
+        "jobs": [job_to_response(row) for row in rows],
+        "total": total,
+        "active_jobs": active_jobs
     }
 
 @app.post("/upload")
 @app.post("/upload/")  # Handle trailing slash
-async def transcribe_audio(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+async def transcribe_audio(file: UploadFile = File(...)):
     """
     Upload an audio file and get back an SRT subtitle file
-    
+
     - **file**: Audio file in supported format (mp3, wav, m4a, flac, ogg, wma)
     - Returns: SRT file for download
     """
-    temp_audio_path = None
-    temp_srt_path = None
-    
     try:
-        # Check memory before processing
-        initial_memory = get_memory_usage()
-        print(f"Initial memory usage: {initial_memory:.1f}MB")
-        
+        # Check memory before processing (debug only)
+        if DEBUG_MEM:
+            print(f"Initial memory usage: {get_memory_usage():.1f}MB")
+
         # Validate file format
         if not file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
         
-        file_extension = os.path.splitext(file.filename)[1].lower()
+        # Parse the filename once and reuse stem/suffix below
+        upload_name = PurePosixPath(file.filename)
+        file_extension = upload_name.suffix.lower()
         if file_extension not in SUPPORTED_FORMATS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Unsupported file format. Supported formats: {', '.join(SUPPORTED_FORMATS)}"
+                detail=UNSUPPORTED_FORMAT_MSG
             )
         
-        # Read file in chunks to avoid memory issues
-        file_size = 0
-        temp_audio_fd, temp_audio_path = tempfile.mkstemp(suffix=file_extension)
-        
-        try:
-            with os.fdopen(temp_audio_fd, 'wb') as temp_file:
-                while chunk := await file.read(8192):  # Read in 8KB chunks
-                    file_size += len(chunk)
-                    if file_size > MAX_FILE_SIZE:
-                        raise HTTPException(
-                            status_code=413,
-                            detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024 * 1024)}MB"
-                        )
-                    temp_file.write(chunk)
-        except Exception as e:
-            cleanup_temp_files(temp_audio_path)
-            raise e
-        
+        # The upload is already spooled by Starlette; measure it in place
+        # and feed it straight to the decoder - no temp file round-trip
+        file_size = file.file.seek(0, os.SEEK_END)
+        if file_size > MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=FILE_TOO_LARGE_MSG
+            )
+        file.file.seek(0)
+
         print(f"File size: {file_size / (1024 * 1024):.1f}MB")
-        
-        # Load model if not already loaded
-        whisper_model = get_model()
-        
-        # Check memory after model loading
-        model_memory = get_memory_usage()
-        print(f"Memory after model load: {model_memory:.1f}MB")
-        
+
         # Transcribe audio using Whisper with optimized settings
+        # (model is loaded at startup via lifespan)
         print("Starting transcription...")
-        whisper_params = get_optimized_whisper_params()
-        
+
         # Add timeout to prevent hanging
         try:
-            result = await asyncio.wait_for(
-                asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: whisper_model.transcribe(
-                        temp_audio_path,
-                        task="transcribe",
-                        language=None,  # Auto-detect language
-                        **whisper_params
-                    )
-                ),
-                timeout=300  # 5 minutes timeout
-            )
+            async with TRANSCRIBE_SEM:
+                segments, info = await asyncio.wait_for(
+                    asyncio.get_event_loop().run_in_executor(
+                        None,
+                        lambda: run_transcription(model, file.file)
+                    ),
+                    timeout=TRANSCRIPTION_TIMEOUT
+                )
         except asyncio.TimeoutError:
-            cleanup_temp_files(temp_audio_path)
             raise HTTPException(
                 status_code=408,
-                detail="Transcription timeout after 5 minutes. Try a shorter audio file or upgrade instance."
+                detail=f"Transcription timeout after {TRANSCRIPTION_TIMEOUT} seconds. Try a shorter audio file or upgrade instance."
             )
-        
+
         print("Transcription completed")
-        
-        # Clean up audio file immediately after transcription
-        cleanup_temp_files(temp_audio_path)
-        temp_audio_path = None
-        
-        # Force garbage collection to free memory
-        gc.collect()
-        
+
         # Convert to SRT format
-        srt_content = create_srt_content(result['segments'])
-        
-        # Create temporary SRT file
-        temp_srt_fd, temp_srt_path = tempfile.mkstemp(suffix='.srt')
-        with os.fdopen(temp_srt_fd, 'w', encoding='utf-8') as temp_srt:
-            temp_srt.write(srt_content)
-        
+        srt_content = create_srt_content(segments)
+
         # Generate output filename
-        base_filename = os.path.splitext(file.filename)[0]
-        output_filename = f"{base_filename}_subtitles.srt"
-        
-        # Schedule cleanup of SRT file after response
-        background_tasks.add_task(cleanup_temp_files, temp_srt_path)
-        
-        final_memory = get_memory_usage()
-        print(f"Final memory usage: {final_memory:.1f}MB")
-        
-        # Return SRT file as download
-        return FileResponse(
-            path=temp_srt_path,
-            filename=output_filename,
-            media_type='application/x-subrip'
+        output_filename = f"{upload_name.stem}_subtitles.srt"
+
+        if DEBUG_MEM:
+            print(f"Final memory usage: {get_memory_usage():.1f}MB")
+
+        # Headers are latin-1 on the wire, so percent-quote the filename
+        # the same way FileResponse does: plain names go out verbatim,
+        # anything else (non-ASCII, quotes) uses the RFC 5987 form
+        quoted_filename = quote(output_filename)
+        if quoted_filename == output_filename:
+            content_disposition = f'attachment; filename="{output_filename}"'
+        else:
+            content_disposition = f"attachment; filename*=utf-8''{quoted_filename}"
+
+        # Return SRT content directly - it is at most a few hundred KB,
+        # so there is no reason to round-trip it through a temp file
+        return Response(
+            content=srt_content,
+            media_type='application/x-subrip',
+            headers={'Content-Disposition': content_disposition}
         )
-        
+
     except HTTPException:
         # Re-raise HTTP exceptions as-is
-        cleanup_temp_files(temp_audio_path, temp_srt_path)
         raise
     except Exception as e:
-        # Clean up any temporary files in case of error
-        cleanup_temp_files(temp_audio_path, temp_srt_path)
-        
-        # Force garbage collection on error
-        gc.collect()
-        
         error_msg = str(e)
         print(f"Transcription error: {error_msg}")
         
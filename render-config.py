@@ -56,8 +56,11 @@ def get_optimized_whisper_params():
     Get Whisper parameters optimized for memory usage
     """
     return {
-        "fp16": False,           # Use fp32 for stability
-        "verbose": False,        # Reduce logging
+        "beam_size": int(os.getenv("WHISPER_BEAM_SIZE", "1")),  # Greedy by default - beam search multiplies decoder cost
+        "best_of": 1,            # No candidate resampling
+        "temperature": 0,        # Deterministic decoding, no fallback ladder
+        "vad_filter": not os.getenv("DISABLE_VAD"),  # Skip silent regions before the encoder runs
+        "vad_parameters": {"min_silence_duration_ms": 500, "speech_pad_ms": 200},
         "word_timestamps": False, # Disable to save memory
         "condition_on_previous_text": False,  # Reduce memory usage
     }
\ No newline at end of file
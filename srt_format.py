@@ -0,0 +1,44 @@
+"""
+SRT formatting helpers
+
+Kept free of framework imports and fully type-annotated so the module
+can be AOT-compiled (mypyc/Cython) in the container build; callers
+import the compiled extension transparently when one is present.
+"""
+import io
+from typing import IO, Iterable
+
+
+def format_timestamp(seconds: float) -> str:
+    """Convert seconds to SRT timestamp format (HH:MM:SS,mmm)"""
+    # Round once to integer milliseconds and split with integer divmod;
+    # avoids timedelta allocation and float rounding near boundaries
+    ms = int(seconds * 1000 + 0.5)
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+
+
+def write_srt(segments: Iterable, fp: IO[str]) -> int:
+    """Stream faster-whisper segments to fp in SRT format
+
+    Formats and writes one block per segment as it arrives, so a lazy
+    segment generator never gets materialized; returns the segment count.
+    """
+    count = 0
+    for i, segment in enumerate(segments, 1):
+        start_time = format_timestamp(segment.start)
+        end_time = format_timestamp(segment.end)
+        text = segment.text.strip()
+
+        fp.write(f"{i}\n{start_time} --> {end_time}\n{text}\n\n")
+        count = i
+    return count
+
+
+def create_srt_content(segments: Iterable) -> str:
+    """Convert faster-whisper segments to a full SRT document string"""
+    buf = io.StringIO()
+    write_srt(segments, buf)
+    return buf.getvalue()